@@ -4,13 +4,25 @@ import getpass
 import sys
 import shutil
 import socket
-import glob
+import heapq
+import fnmatch
 import threading
+import itertools
 import time
 import json
 import queue
 import re
+import struct
+import contextlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+try:
+    # Optional drop-in zlib with SIMD (PCLMUL/AVX2) CRC32 and deflate; pip install zlib-ng
+    from zlib_ng import zlib_ng as zlib
+    zipfile.crc32 = zlib.crc32 # Also used by ZipFile for streamed members and restore checks
+except ImportError:
+    import zlib
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
 from PIL import Image, ImageDraw
@@ -38,6 +50,14 @@ DEFAULT_CONFIG = {
     "ignore_patterns": ["__pycache__", ".git", "*.tmp", "*.log", ".tmp.driveupload", "desktop.ini"],
     "scheduled_times": []          # List of "HH:MM" strings
 }
+STREAM_THRESHOLD = 16 * 1024 * 1024  # Files above this are streamed instead of compressed in memory
+INFLIGHT_BYTES = 64 * 1024 * 1024    # Max source bytes held by compressor threads at once
+COPY_BUFSIZE = 1024 * 1024           # Read/write chunk for streamed archive members
+PROGRESS_INTERVAL = 0.1              # Seconds between progress updates sent to the UI
+SCHEDULER_MAX_SLEEP = 300            # Longest single scheduler sleep, in seconds
+UI_QUEUE_SIZE = 1024                 # Max pending log/progress messages for the UI
+WINDOWS_RESERVED_CHARS = frozenset('<>:"|?*' + ''.join(map(chr, range(32))))
+SCHEDULE_TIME_RE = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$") # 24h "HH:MM"
 
 class SyncConfig:
     def __init__(self):
@@ -46,6 +66,7 @@ class SyncConfig:
         self.hostname = socket.gethostname()
         self.base_user_path = rf"C:\Users\{self.current_user}"
         self.file_prefix = "Antigravity_Backup"
+        self._ignore_rules = None
         
         if not self.config["drive_path"]:
             self.detect_drive_path()
@@ -81,24 +102,50 @@ class SyncConfig:
 
     def set(self, key, value):
         self.config[key] = value
+        if key == "ignore_patterns":
+            self._ignore_rules = None
         self.save_config()
 
+    def ignore_rules(self):
+        # (literal_names, wildcard_match, fold_case) built from ignore_patterns, rebuilt after set().
+        # Plain names like ".git" are a set lookup; only real wildcards go through the regex.
+        if self._ignore_rules is None:
+            patterns = self.get("ignore_patterns")
+            fold_case = os.name == "nt" # fnmatch ignores case on Windows
+            literals = frozenset(p.lower() if fold_case else p for p in patterns if not any(c in p for c in "*?["))
+            wildcards = [p for p in patterns if any(c in p for c in "*?[")]
+            regex = re.compile("|".join(fnmatch.translate(p) for p in wildcards) or r"(?!)",
+                               re.IGNORECASE if fold_case else 0)
+            self._ignore_rules = (literals, regex.match, fold_case)
+        return self._ignore_rules
+
 # ==================== LOGIC CLASS ====================
 class SyncLogic:
     def __init__(self, config_manager, msg_queue):
         self.cfg = config_manager
         self.queue = msg_queue
         self.stop_requested = False
+        self._last_progress_t = 0.0
 
     def log(self, text, type="info"):
         if self.queue:
-            self.queue.put(("log", text))
+            try: self.queue.put_nowait(("log", text))
+            except queue.Full: pass # UI is behind; drop rather than stall the worker
         else:
             print(text) # Fallback for background scheduler if GUI closed
 
     def progress(self, val, msg, elapsed, eta):
         if self.queue:
-            self.queue.put(("progress", (val, msg, elapsed, eta)))
+            try: self.queue.put_nowait(("progress", (val, msg, elapsed, eta)))
+            except queue.Full: pass
+
+    def _progress_due(self, done, total):
+        # Rate-limit progress to ~10 Hz, always letting the final update through
+        now = time.monotonic()
+        if done < total and now - self._last_progress_t < PROGRESS_INTERVAL:
+            return False
+        self._last_progress_t = now
+        return True
 
     def finish(self, success, msg=""):
         if self.queue:
@@ -124,40 +171,159 @@ class SyncLogic:
                 return False
         return True
 
-    def should_ignore(self, path):
-        patterns = self.cfg.get("ignore_patterns")
-        # Check all parts of the path
-        parts = path.replace('\\', '/').split('/')
-        for part in parts:
-            for p in patterns:
-                if glob.fnmatch.fnmatch(part, p):
-                    return True
-        return False
+    def _scan_folder(self, source_path, folder, ignore_rules, silent=False):
+        # Explicit scandir stack so each DirEntry's cached stat reaches the ZipInfo.
+        # Every entry.path starts with source_path, so archive names are built by slicing.
+        src_len = len(os.path.join(source_path, ""))
+        arc_prefix = folder.replace("\\", "/").rstrip("/") + "/"
+        literals, wild, fold_case = ignore_rules
+        stack = deque([source_path])
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue # Unreadable directory, skipped like os.walk does
+            with it:
+                try:
+                    for entry in it:
+                        name = entry.name
+                        if (name.lower() if fold_case else name) in literals or wild(name):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            if not entry.is_file():
+                                continue
+                            st = entry.stat()
+                        except OSError as e:
+                            # Deleted or locked between readdir and stat; skip only this entry
+                            if not silent: self.log(f"Error skipping file {entry.path}: {e}", "error")
+                            continue
+                        arcname = arc_prefix + entry.path[src_len:].replace("\\", "/")
+                        yield entry.path, arcname, st
+                except OSError:
+                    pass # Directory listing failed part way, os.walk stops there too
+
+    def _zipinfo_from_stat(self, arcname, st, level):
+        # What ZipInfo.from_file builds, without stat-ing the file again
+        date_time = time.localtime(st.st_mtime)[:6]
+        if date_time[0] < 1980: date_time = (1980, 1, 1, 0, 0, 0)
+        if date_time[0] > 2107: date_time = (2107, 12, 31, 23, 59, 59)
+        date_time = date_time[:5] + (date_time[5] // 2 * 2,) # ZIP keeps 2-second resolution
+        zinfo = zipfile.ZipInfo(arcname, date_time)
+        zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+        zinfo.file_size = st.st_size
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo._compresslevel = level
+        return zinfo
+
+    def _compress_entry(self, src_file, zinfo, level):
+        # Runs on a worker thread; zlib releases the GIL while deflating
+        if zinfo.file_size > STREAM_THRESHOLD:
+            return None
+        with open(src_file, 'rb') as f:
+            data = f.read()
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        raw = compressor.compress(data) + compressor.flush()
+        zinfo.file_size = len(data)
+        zinfo.compress_size = len(raw)
+        zinfo.CRC = zlib.crc32(data)
+        return raw
+
+    def _compress_in_order(self, pool, files_to_zip, level, window, prev_index):
+        # Keep at most `window` files and INFLIGHT_BYTES of source data in flight so memory
+        # stays bounded. Files whose size and mtime match the previous archive are yielded
+        # with its ZipInfo instead of a future.
+        pending = deque()
+        in_flight = 0
+        for src_file, zip_path, st in files_to_zip:
+            zinfo = self._zipinfo_from_stat(zip_path, st, level)
+            prev = prev_index.get(zinfo.filename)
+            if (prev and prev.file_size == zinfo.file_size and prev.date_time == zinfo.date_time
+                    and prev.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) and not prev.flag_bits & 0x1):
+                entry, cost = (src_file, zinfo, None, prev), 0
+            else:
+                entry = (src_file, zinfo, pool.submit(self._compress_entry, src_file, zinfo, level), None)
+                # Streamed files are never read into memory by the workers
+                cost = zinfo.file_size if zinfo.file_size <= STREAM_THRESHOLD else 0
+            pending.append((entry, cost))
+            in_flight += cost
+            while pending and (len(pending) >= window or in_flight > INFLIGHT_BYTES):
+                entry, cost = pending.popleft()
+                in_flight -= cost
+                yield entry
+        for entry, cost in pending:
+            yield entry
+
+    def _raw_member(self, fp, info):
+        # Check the member's local header and seek to its compressed bytes up front,
+        # so a damaged archive fails before anything is written to the new one
+        fp.seek(info.header_offset)
+        header = fp.read(zipfile.sizeFileHeader)
+        if len(header) != zipfile.sizeFileHeader or header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        fp.seek(name_len + extra_len, os.SEEK_CUR)
+        return self._read_chunks(fp, info.compress_size, info.filename)
+
+    def _read_chunks(self, fp, size, name):
+        remaining = size
+        while remaining > 0:
+            chunk = fp.read(min(COPY_BUFSIZE, remaining))
+            if not chunk:
+                raise EOFError(f"Truncated member {name}")
+            remaining -= len(chunk)
+            yield chunk
+
+    def _write_compressed(self, zip_file, zinfo, chunks):
+        # Append an already compressed member (same steps as ZipFile.open(..., 'w') minus the compressor)
+        zip_file._writecheck(zinfo)
+        zip_file._didModify = True
+        # Start at the end of the last complete member, so a failed partial write gets overwritten
+        zip_file.fp.seek(zip_file.start_dir)
+        zinfo.header_offset = zip_file.start_dir
+        zip_file.fp.write(zinfo.FileHeader())
+        for chunk in chunks:
+            zip_file.fp.write(chunk)
+        zip_file.start_dir = zip_file.fp.tell()
+        zip_file.filelist.append(zinfo)
+        zip_file.NameToInfo[zinfo.filename] = zinfo
+
+    def list_backups(self, drive_path):
+        # Plain prefix/suffix checks instead of glob's per-call fnmatch regex
+        prefix = f"{self.cfg.file_prefix}_"
+        try:
+            with os.scandir(drive_path) as it:
+                return [e.path for e in it if e.name.startswith(prefix) and e.name.endswith(".zip") and e.is_file()]
+        except OSError:
+            return []
 
     def cleanup_old_backups(self):
         count = self.cfg.get("retention_count")
         drive_path = self.cfg.get("drive_path")
         
         self.log(f"Cleaning up logic (Keep last {count})...")
-        pattern = os.path.join(drive_path, f"{self.cfg.file_prefix}_*.zip")
-        files = glob.glob(pattern)
-        files.sort(reverse=True) 
+        files = self.list_backups(drive_path)
 
         if len(files) > count:
-            files_to_delete = files[count:]
-            for f in files_to_delete:
-                try:
-                    os.remove(f)
-                    self.log(f"Deleted old backup: {os.path.basename(f)}")
-                except Exception as e:
-                    self.log(f"Failed to delete {os.path.basename(f)}: {e}", "error")
+            # Names end in a timestamp, so the newest sort last
+            keep = set(heapq.nlargest(count, files))
+            files_to_delete = [f for f in files if f not in keep]
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = {pool.submit(os.unlink, f): f for f in files_to_delete}
+                for future in as_completed(futures):
+                    f = futures[future]
+                    try:
+                        future.result()
+                        self.log(f"Deleted old backup: {os.path.basename(f)}")
+                    except Exception as e:
+                        self.log(f"Failed to delete {os.path.basename(f)}: {e}", "error")
 
     def scan_for_backups(self):
         if not self.ensure_drive(): return
         drive_path = self.cfg.get("drive_path")
-        pattern = os.path.join(drive_path, f"{self.cfg.file_prefix}_*.zip")
-        files = glob.glob(pattern)
-        files.sort(reverse=True)
+        files = sorted(self.list_backups(drive_path), reverse=True) # Every entry is listed, so full sort
         
         if files:
             self.log(f"=== Found {len(files)} remote backups ===")
@@ -168,6 +334,70 @@ class SyncLogic:
         else:
             self.log("=== No remote backups found ===")
 
+    def _write_archive(self, output_path, files_to_zip, compression, start_time, silent, previous=None):
+        # Returns False if the user cancelled part way through.
+        # `previous` is (path, {name: ZipInfo}) of the last archive; unchanged files are copied from it.
+        total_files = len(files_to_zip)
+        # Files are deflated in parallel on worker threads and appended in order;
+        # anything above STREAM_THRESHOLD is streamed through ZipFile.open().
+        workers = os.cpu_count() or 1
+        prev_path, prev_index = previous or (None, {})
+        reused = 0
+
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compression, allowZip64=True) as zip_file, \
+                ThreadPoolExecutor(max_workers=workers) as pool, \
+                (open(prev_path, 'rb') if prev_path else contextlib.nullcontext()) as prev_fp:
+            entries = self._compress_in_order(pool, files_to_zip, compression, workers * 4, prev_index)
+            for idx, (src_file, zinfo, future, prev) in enumerate(entries):
+                if self.stop_requested:
+                    if not silent: self.log("Backup Cancelled.")
+                    return False
+
+                try:
+                    if prev is not None:
+                        # Unchanged since the last backup: copy its compressed bytes as-is
+                        try:
+                            zinfo.compress_type = prev.compress_type
+                            zinfo.compress_size = prev.compress_size
+                            zinfo.CRC = prev.CRC
+                            self._write_compressed(zip_file, zinfo, self._raw_member(prev_fp, prev))
+                            reused += 1
+                        except (OSError, zipfile.BadZipFile, EOFError):
+                            # Previous archive is damaged here; compress the file after all
+                            zinfo.compress_type = zipfile.ZIP_DEFLATED
+                            prev = None
+                            future = pool.submit(self._compress_entry, src_file, zinfo, compression)
+                    if prev is None:
+                        raw = future.result()
+                        if raw is None:
+                            with open(src_file, 'rb', buffering=COPY_BUFSIZE) as src, \
+                                    zip_file.open(zinfo, 'w', force_zip64=True) as dst:
+                                shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+                        else:
+                            self._write_compressed(zip_file, zinfo, (raw,))
+                except Exception as fe:
+                    if not silent: self.log(f"Error skipping file {src_file}: {fe}", "error")
+
+                self._report_backup_progress(idx + 1, total_files, start_time, silent)
+
+        if reused and not silent: self.log(f"Reused {reused} unchanged files from {os.path.basename(prev_path)}")
+        return True
+
+    def _report_backup_progress(self, done, total_files, start_time, silent):
+        if silent or not self._progress_due(done, total_files):
+            return
+
+        elapsed = time.time() - start_time
+        progress_val = done / total_files
+        
+        eta_str = "--:--"
+        if progress_val > 0:
+            total_estimated_time = elapsed / progress_val
+            remaining_time = total_estimated_time - elapsed
+            eta_str = self.format_time(remaining_time)
+        
+        self.progress(progress_val, "", self.format_time(elapsed), eta_str)
+
     def run_backup(self, silent=False):
         start_time = time.time()
         try:
@@ -176,29 +406,26 @@ class SyncLogic:
                 if not silent: self.finish(False, "Drive not available")
                 return
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final_zip_name = f"{self.cfg.file_prefix}_{self.cfg.hostname}_{timestamp}.zip"
+            # Snapshot config once; the scan below runs per file
+            base = self.cfg.base_user_path
+            prefix = self.cfg.file_prefix
+            targets = self.cfg.get("target_folders")
             drive_path = self.cfg.get("drive_path")
+            compression = self.cfg.get("compression_level")
+            ignore_rules = self.cfg.ignore_rules()
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            final_zip_name = f"{prefix}_{self.cfg.hostname}_{timestamp}.zip"
             full_output_path = os.path.join(drive_path, final_zip_name)
 
             files_to_zip = []
-            for folder in self.cfg.get("target_folders"):
+            for folder in targets:
                 folder = folder.strip()
                 if not folder: continue
-                source_path = os.path.join(self.cfg.base_user_path, folder)
+                source_path = os.path.join(base, folder)
                 if os.path.exists(source_path):
                     if not silent: self.log(f"Scanning: {source_path}")
-                    for root, dirs, files in os.walk(source_path):
-                        # Filter directories
-                        dirs[:] = [d for d in dirs if not self.should_ignore(d)]
-                        
-                        for file in files:
-                            if self.should_ignore(file):
-                                continue
-                                
-                            full_file_path = os.path.join(root, file)
-                            arcname = os.path.join(folder, os.path.relpath(full_file_path, source_path))
-                            files_to_zip.append((full_file_path, arcname))
+                    files_to_zip.extend(self._scan_folder(source_path, folder, ignore_rules, silent))
                 else:
                     if not silent: self.log(f"Warning: Folder {folder} not found.", "warning")
 
@@ -209,38 +436,34 @@ class SyncLogic:
                 return
 
             if not silent: self.log(f"Creating archive: {final_zip_name}")
-            total_files = len(files_to_zip)
-            compression = self.cfg.get("compression_level")
-            # Map 0-9 roughly to zipfile compression args (if using lzma/bzip2) 
-            # or just use ZIP_DEFLATED level if python supported it easily, 
-            # standard zipfile uses ZIP_DEFLATED (level 6 approx). 
-            # Here we just use ZIP_DEFLATED as simple switch.
-            
-            with zipfile.ZipFile(full_output_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for idx, (src_file, zip_path) in enumerate(files_to_zip):
-                    if self.stop_requested:
-                        if not silent: self.log("Backup Cancelled.")
-                        zip_file.close() 
-                        try: os.remove(full_output_path)
-                        except: pass
-                        if not silent: self.finish(False, "Cancelled")
-                        return
+            # Latest archive from this machine; files unchanged since then are copied, not recompressed
+            previous = None
+            own_backups = [f for f in self.list_backups(drive_path)
+                           if os.path.basename(f).startswith(f"{prefix}_{self.cfg.hostname}_")]
+            if own_backups:
+                prev_path = max(own_backups)
+                try:
+                    with zipfile.ZipFile(prev_path, 'r') as prev_zf:
+                        previous = (prev_path, {i.filename: i for i in prev_zf.infolist()})
+                except Exception as e:
+                    if not silent: self.log(f"Previous backup unreadable, compressing everything: {e}", "warning")
 
-                    try:
-                        zip_file.write(src_file, zip_path)
-                    except Exception as fe:
-                        if not silent: self.log(f"Error skipping file {src_file}: {fe}", "error")
-                    
-                    elapsed = time.time() - start_time
-                    progress_val = (idx + 1) / total_files
-                    
-                    eta_str = "--:--"
-                    if progress_val > 0:
-                        total_estimated_time = elapsed / progress_val
-                        remaining_time = total_estimated_time - elapsed
-                        eta_str = self.format_time(remaining_time)
-                    
-                    if not silent: self.progress(progress_val, "", self.format_time(elapsed), eta_str)
+            # Write to a .part file and only rename it once complete, so a cancelled
+            # or crashed run never leaves something that looks like a real backup
+            part_path = full_output_path + ".part"
+            completed = False
+            try:
+                if self._write_archive(part_path, files_to_zip, compression, start_time, silent, previous):
+                    os.replace(part_path, full_output_path)
+                    completed = True
+            finally:
+                if not completed:
+                    try: os.unlink(part_path)
+                    except: pass
+
+            if not completed:
+                if not silent: self.finish(False, "Cancelled")
+                return
 
             if not silent: self.log(f"[SUCCESS] Backup saved to: {full_output_path}")
             self.cleanup_old_backups()
@@ -253,6 +476,54 @@ class SyncLogic:
                 self.finish(False, str(e))
             return False
 
+    def _restore_target(self, base, parts):
+        # Local path for an archive member, or None if its name could leave `base`
+        # (drive letters, '..', embedded separators) or is not a valid local file name
+        if parts[0] == '':
+            return None # Absolute name
+        parts = [p for p in parts if p not in ('', '.')]
+        if not parts:
+            return None
+        for part in parts:
+            if part == '..' or os.path.splitdrive(part)[0] or os.sep in part or (os.altsep and os.altsep in part):
+                return None
+            if os.name == "nt" and (WINDOWS_RESERVED_CHARS.intersection(part) or part[-1] in ". "):
+                return None
+        root = os.path.normpath(base)
+        target = os.path.normpath(os.path.join(root, *parts))
+        try:
+            if os.path.commonpath([root, target]) != root:
+                return None
+        except ValueError:
+            return None # Different drives
+        return target
+
+    def _extract_chunk(self, backup_path, entries, done, total_files, start_time):
+        # Runs on a worker thread with its own ZipFile handle; entries are pre-validated (ZipInfo, target)
+        with zipfile.ZipFile(backup_path, 'r') as zf:
+            for info, target in entries:
+                if self.stop_requested:
+                    return
+
+                try:
+                    with zf.open(info) as src, open(target, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+                except PermissionError:
+                     self.log(f"⚠️ SKIPPED (Locked): {info.filename}", "error")
+                except Exception as e:
+                     self.log(f"⚠️ Error extracting {info.filename}: {e}", "error")
+
+                idx = next(done)
+                if not self._progress_due(idx, total_files):
+                    continue
+
+                elapsed = time.time() - start_time
+                # Map actual extraction to 10-100% range
+                progress_val = 0.1 + (idx / total_files * 0.9)
+                total_estimated = elapsed / progress_val # Total time based on overall progress
+                eta_str = self.format_time(max(0, total_estimated - elapsed))
+                self.progress(progress_val, f"Copying files... ({idx}/{total_files})", self.format_time(elapsed), eta_str)
+
     def run_restore(self):
         start_time = time.time()
         try:
@@ -261,17 +532,19 @@ class SyncLogic:
                 self.finish(False, "Drive not available")
                 return
             
+            # Snapshot config once; the loops below run per archive member
             drive_path = self.cfg.get("drive_path")
-            pattern = os.path.join(drive_path, f"{self.cfg.file_prefix}_*.zip")
-            files = glob.glob(pattern)
+            base = self.cfg.base_user_path
+            literals, wild, fold_case = self.cfg.ignore_rules()
+
+            files = self.list_backups(drive_path)
             
             if not files:
                 self.log("No backup files found in Drive.", "error")
                 self.finish(False, "No backups found")
                 return
             
-            files.sort(reverse=True)
-            latest_backup = files[0]
+            latest_backup = max(files)
             filename = os.path.basename(latest_backup)
             self.log(f"Found latest backup: {filename}")
             
@@ -287,55 +560,59 @@ class SyncLogic:
                     # First pass: Check conflicts and update progress slightly
                     for i, file in enumerate(file_list):
                         # Show some activity during analysis (0-10%)
-                        # Show some activity during analysis (0-10%)
-                        an_prog = (i / total_files) * 0.1
-                        self.progress(an_prog, "Analyzing...", self.format_time(time.time()-start_time), "--:--")
+                        if self._progress_due(i + 1, total_files):
+                            an_prog = (i / total_files) * 0.1
+                            self.progress(an_prog, "Analyzing...", self.format_time(time.time()-start_time), "--:--")
 
-                        dest_path = os.path.join(self.cfg.base_user_path, file)
+                        dest_path = os.path.join(base, file)
                         if os.path.exists(dest_path):
                             # Compare times. Zip stores time as tuple (Y,M,D,H,M,S)
                             # Logic: If local file mtime > zip time, warn.
                             pass # For now overly complex to do precise per-file prompt.
                             
-                    # Extract
-                    for idx, file in enumerate(file_list):
-                        if self.stop_requested:
-                            self.finish(False, "Cancelled")
-                            return
-
-                        if file.startswith("..") or os.path.isabs(file):
+                    # Extract: validate every member once up front, then split the work
+                    # across threads that each read through their own ZipFile handle
+                    to_extract = []
+                    folders = set()
+                    for info in zf.infolist():
+                        parts = info.filename.split('/') # Archive names always use '/'
+                        # Any ignored folder skips everything below it
+                        if any((part.lower() if fold_case else part) in literals or wild(part) for part in parts):
                             continue
-
-                        if self.should_ignore(file):
-                            # self.log(f"Skipping ignored: {file}")
+                        target = self._restore_target(base, parts)
+                        if target is None:
+                            self.log(f"⚠️ SKIPPED (unsafe name): {info.filename}", "error")
                             continue
-                        
+                        if info.is_dir():
+                            folders.add(target)
+                        else:
+                            folders.add(os.path.dirname(target))
+                            to_extract.append((info, target))
+                    # Create folders up front so workers don't race on makedirs
+                    failed_folders = set()
+                    for folder in folders:
                         try:
-                            zf.extract(file, self.cfg.base_user_path)
-                        except PermissionError:
-                             self.log(f"⚠️ SKIPPED (Locked): {file}", "error")
-                             continue
-                        except Exception as e:
-                             self.log(f"⚠️ Error extracting {file}: {e}", "error")
-                             continue
-                        
-                        elapsed = time.time() - start_time
-                        # Map actual extraction to 10-100% range
-                        # progress_val = (idx + 1) / total_files 
-                        progress_val = 0.1 + ((idx + 1) / total_files * 0.9)
-                        
-                        eta_str = "--:--"
-                        eta_str = "--:--"
-                        if progress_val > 0.1: # Avoid division by zero or tiny numbers
-                             # Calculate based on the extraction part (0.1 to 1.0 range)
-                             scaled_prog = (progress_val - 0.1) / 0.9
-                             if scaled_prog > 0:
-                                total_estimated = (time.time() - start_time) / progress_val # Total time based on overall progress
-                                rem = total_estimated - (time.time() - start_time)
-                                eta_str = self.format_time(max(0, rem))
-                        
-                        self.progress(progress_val, f"Copying files... ({idx+1}/{total_files})", self.format_time(elapsed), eta_str)
-                        time.sleep(0.005) # Force UI breather
+                            os.makedirs(folder, exist_ok=True)
+                        except OSError as e:
+                            self.log(f"⚠️ SKIPPED folder {folder}: {e}", "error")
+                            failed_folders.add(folder)
+                    if failed_folders:
+                        to_extract = [(info, target) for info, target in to_extract
+                                      if os.path.dirname(target) not in failed_folders]
+
+                workers = os.cpu_count() or 1
+                chunk_size = max(1, -(-len(to_extract) // workers))
+                done = itertools.count(1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(self._extract_chunk, latest_backup, to_extract[i:i + chunk_size],
+                                           done, len(to_extract), start_time)
+                               for i in range(0, len(to_extract), chunk_size)]
+                    for future in futures:
+                        future.result()
+
+                if self.stop_requested:
+                    self.finish(False, "Cancelled")
+                    return
 
             except Exception as e:
                 self.log(f"Zip Error: {e}")
@@ -413,11 +690,7 @@ class SettingsDialog(ctk.CTkToplevel):
         
         # Schedule
         raw_times = self.entry_schedule.get().split(",")
-        valid_times = []
-        for t in raw_times:
-            t = t.strip()
-            if re.match(r"^\d{2}:\d{2}$", t):
-                valid_times.append(t)
+        valid_times = [t for t in (x.strip() for x in raw_times) if SCHEDULE_TIME_RE.match(t)]
         self.cfg.set("scheduled_times", valid_times)
 
         # Retention
@@ -426,6 +699,8 @@ class SettingsDialog(ctk.CTkToplevel):
             self.cfg.set("retention_count", r)
         except: pass
 
+        self.master.rebuild_logic()
+        self.master.schedule_changed.set()
         messagebox.showinfo("Settings", "Configuration saved!")
         self.destroy()
 
@@ -454,9 +729,12 @@ class SyncApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.cfg = SyncConfig()
-        self.queue = queue.Queue()
+        self.queue = queue.Queue(maxsize=UI_QUEUE_SIZE)
         self.is_minimized = False
         self.tray_icon = None
+        self.logic = None
+        self.schedule_changed = threading.Event()
+        self.rebuild_logic()
 
         # Window Setup
         self.title(f"Antigravity Sync {APP_VERSION}")
@@ -465,6 +743,7 @@ class SyncApp(ctk.CTk):
         self.protocol('WM_DELETE_WINDOW', self.on_closing)
 
         self.setup_ui()
+        self.setup_tray()
         self.setup_scheduler()
         
         # Periodic Queue Check
@@ -553,18 +832,21 @@ class SyncApp(ctk.CTk):
         dc.rectangle((width // 4, height // 4, width * 3 // 4, height * 3 // 4), fill=color2)
         return image
 
+    def setup_tray(self):
+        # One icon and loop thread for the whole session; minimize/restore only toggle visibility
+        image = self.create_image()
+        menu = (pystray.MenuItem('Show', self.show_window), pystray.MenuItem('Exit', self.quit_app))
+        self.tray_icon = pystray.Icon("name", image, "Antigravity Sync", menu)
+        # A custom setup keeps the icon hidden until the window is minimized
+        threading.Thread(target=self.tray_icon.run, kwargs={"setup": lambda icon: None}, daemon=True).start()
+
     def minimize_to_tray(self):
         self.withdraw()
         self.is_minimized = True
-        if not self.tray_icon:
-            image = self.create_image()
-            menu = (pystray.MenuItem('Show', self.show_window), pystray.MenuItem('Exit', self.quit_app))
-            self.tray_icon = pystray.Icon("name", image, "Antigravity Sync", menu)
-            threading.Thread(target=self.tray_icon.run, daemon=True).start()
+        self.tray_icon.visible = True
 
     def show_window(self, icon, item):
-        self.tray_icon.stop()
-        self.tray_icon = None
+        self.tray_icon.visible = False
         self.after(0, self.deiconify)
         self.is_minimized = False
 
@@ -603,64 +885,86 @@ class SyncApp(ctk.CTk):
         self.after(1000, self.startup_scan)
 
     def startup_scan(self):
-        logic = SyncLogic(self.cfg, self.queue)
-        threading.Thread(target=logic.scan_for_backups, daemon=True).start()
+        threading.Thread(target=self.ui_logic.scan_for_backups, daemon=True).start()
+
+    def next_scheduled_run(self, now):
+        # Nearest upcoming scheduled time after `now`, or None if nothing is scheduled
+        upcoming = []
+        for hm in self.cfg.get("scheduled_times"):
+            try:
+                at = datetime.combine(now.date(), datetime.strptime(hm, "%H:%M").time())
+            except ValueError:
+                continue
+            upcoming.append(at if at > now else at + timedelta(days=1))
+        return min(upcoming, default=None)
 
     def scheduler_loop(self):
-        last_run_minute = ""
         while True:
             now = datetime.now()
-            current_hm = now.strftime("%H:%M")
-            
-            # Check if this minute matches a scheduled time and hasn't run yet
-            scheduled = self.cfg.get("scheduled_times")
-            if current_hm in scheduled and current_hm != last_run_minute:
-                # Trigger backup
-                self.queue.put(("log", f"⏰ Auto-Backup triggered at {current_hm}"))
-                logic = SyncLogic(self.cfg, None) # No queue for background task mostly
-                # We can't update UI progress easily if another backup is running, 
-                # but we can try to aquire a lock or just run logic.
-                # ideally we push to queue log to update UI if open
-                if threading.active_count() < 5: # Primitive guard
-                     threading.Thread(target=logic.run_backup, args=(True,), daemon=True).start()
-                last_run_minute = current_hm
-            
-            time.sleep(10)
+            next_run = self.next_scheduled_run(now)
+
+            # Sleep until the next trigger; saving settings sets schedule_changed to wake us early.
+            # The wait is capped so clock changes and system sleep get picked up.
+            timeout = None if next_run is None else min((next_run - now).total_seconds(), SCHEDULER_MAX_SLEEP)
+            if self.schedule_changed.wait(timeout):
+                self.schedule_changed.clear()
+                continue
+            if datetime.now() < next_run:
+                continue
+
+            # Trigger backup
+            try: self.queue.put_nowait(("log", f"⏰ Auto-Backup triggered at {next_run.strftime('%H:%M')}"))
+            except queue.Full: pass
+            logic = self.bg_logic
+            # We can't update UI progress easily if another backup is running, 
+            # but we can try to aquire a lock or just run logic.
+            # ideally we push to queue log to update UI if open
+            if threading.active_count() < 5: # Primitive guard
+                 threading.Thread(target=logic.run_backup, args=(True,), daemon=True).start()
+
+    def rebuild_logic(self):
+        # Long-lived workers; rebuilt only when settings change
+        self.bg_logic = SyncLogic(self.cfg, None) # No queue for background task mostly
+        self.ui_logic = SyncLogic(self.cfg, self.queue)
 
     # --- Runtime ---
     def check_queue(self):
+        # Drain everything queued since the last tick, then touch each widget once
+        lines, progress, finished = [], None, []
         try:
-            while True:
+            for _ in range(UI_QUEUE_SIZE):
                 msg_type, data = self.queue.get_nowait()
                 if msg_type == "log":
-                    self.log_to_ui(data)
+                    lines.append(data)
                 elif msg_type == "progress":
-                    val, msg, elapsed, eta = data
-                    self.update_progress_ui(val, elapsed, eta)
+                    progress = data
                 elif msg_type == "finish":
-                    success, msg = data
-                    self.on_finish(success, msg)
+                    finished.append(data)
         except queue.Empty:
             pass
+        try:
+            if lines:
+                self.log_to_ui(*lines)
+            if progress:
+                val, msg, elapsed, eta = progress
+                self.update_progress_ui(val, elapsed, eta)
+            for success, msg in finished:
+                self.on_finish(success, msg)
         finally:
             self.after(100, self.check_queue)
 
-    def log_to_ui(self, message):
+    def log_to_ui(self, *messages):
         self.log_textbox.configure(state="normal")
-        ts = datetime.now().strftime("%H:%M:%S")
-        self.log_textbox.insert("end", f"[{ts}] {message}\n")
+        ts = time.strftime("%H:%M:%S") # One timestamp per drained batch
+        self.log_textbox.insert("end", "".join(f"[{ts}] {m}\n" for m in messages))
         self.log_textbox.see("end")
         self.log_textbox.configure(state="disabled")
-        try: self.update_idletasks()
-        except: pass
 
     def update_progress_ui(self, val, elapsed, eta):
         self.progress_bar.set(val)
         self.label_percent.configure(text=f"{int(val*100)}%")
         self.label_time.configure(text=f"Time: {elapsed}")
         self.label_eta.configure(text=f"ETA: {eta}")
-        try: self.update_idletasks()
-        except: pass
 
     def on_finish(self, success, msg):
         self.lock_ui(False)
@@ -680,14 +984,16 @@ class SyncApp(ctk.CTk):
 
     def start_backup(self):
         self.lock_ui(True)
-        self.logic = SyncLogic(self.cfg, self.queue)
+        self.logic = self.ui_logic
+        self.logic.stop_requested = False
         self.running_thread = threading.Thread(target=self.logic.run_backup, daemon=True)
         self.running_thread.start()
 
     def confirm_restore(self):
         if messagebox.askyesno("Confirm", "Overwrite local files?"):
             self.lock_ui(True)
-            self.logic = SyncLogic(self.cfg, self.queue)
+            self.logic = self.ui_logic
+            self.logic.stop_requested = False
             self.running_thread = threading.Thread(target=self.logic.run_restore, daemon=True)
             self.running_thread.start()
 